@@ -6,7 +6,13 @@ import logging
 
 class GenericDataset(Dataset):
     def __init__(self, data_file: str, shape: Optional[Tuple[int, ...]] = None):
-        dataset = torch.load(data_file)
+        # mmap keeps tensors in the page cache, shared by all DataLoader workers;
+        # legacy (non-zipfile) files cannot be mapped and are loaded normally
+        try:
+            dataset = torch.load(data_file, mmap=True)
+        except RuntimeError as e:
+            logging.info(f"mmap load not supported for {data_file} ({e}), loading into memory")
+            dataset = torch.load(data_file)
         self.data = dataset["data"]
         self.labels = dataset["labels"]
 
@@ -17,13 +23,29 @@ class GenericDataset(Dataset):
         else:
             self.input_format = shape
 
+        # Stack per-sample lists into one contiguous tensor (SoA) when all
+        # samples share a shape; ragged lists are kept and reshaped per item
+        if isinstance(self.data, (list, tuple)):
+            shapes = {tuple(t.shape) if torch.is_tensor(t) else None for t in self.data}
+            if len(shapes) == 1 and None not in shapes:
+                self.data = torch.stack(list(self.data)).contiguous()
+
+        # Reshape once here instead of on every __getitem__
+        self.reshape_per_item = False
+        if self.input_format:
+            try:
+                self.data = self.data.view(len(self.data), *self.input_format)
+            except (AttributeError, RuntimeError):
+                # Ragged list or non-viewable tensor: reshape per item
+                self.reshape_per_item = True
+
     def __len__(self):
         return len(self.labels)
 
     def __getitem__(self, idx):
         data, label = self.data[idx], self.labels[idx]
 
-        if self.input_format:
+        if self.reshape_per_item:
             try:
                 data = data.view(*self.input_format)
             except Exception as e:
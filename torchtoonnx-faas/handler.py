@@ -1,14 +1,21 @@
 import os
+import gc
 import json
 import torch
 import logging
 import inspect
 import tempfile
+import hashlib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, CancelledError, as_completed
 import onnx
 from minio import Minio
+from minio.commonconfig import CopySource
 from minio.error import S3Error
+from urllib3.exceptions import HTTPError
 from urllib.parse import urljoin
-from .utils import load_class_from_file, parse_dynamic_args
+from .utils import get_class_from_file, parse_dynamic_args
 
 # ============================================================
 # CONFIGURATION
@@ -16,11 +23,29 @@ from .utils import load_class_from_file, parse_dynamic_args
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+# Create the CUDA context during cold start rather than on the first request
+if DEVICE.type == "cuda":
+    torch.empty(1, device=DEVICE)
+
+# torch.onnx.export(..., dynamo=True) is available from PyTorch 2.5;
+# export_onnx() retries with the legacy exporter if it fails
+EXPORT_MODE = "dynamo" if torch.__version__ >= "2.5" else "legacy"
+OPSET_VERSION = 17
+
 MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "172.16.6.62:9000")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "minioadmin")
 MINIO_SECURE = os.getenv("MINIO_SECURE", "0") == "1"
 
+# Work directory for weights/ONNX (default: system temp dir). Set WORK_DIR=/dev/shm
+# to keep them in RAM-backed tmpfs, only if shm is sized for weights + ONNX
+# (containers default to 64 MB, and tmpfs pages count against the memory limit)
+WORK_DIR = os.getenv("WORK_DIR") or None
+
+# Shared volume for traced torch.export programs (dynamo exporter only);
+# caching is disabled unless the directory is configured and mounted
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR")
+
 client = Minio(
     MINIO_ENDPOINT,
     access_key=MINIO_ACCESS_KEY,
@@ -33,6 +58,21 @@ BUCKET_MODELS = "models"
 BUCKET_WEIGHTS = "weights"
 BUCKET_OUTPUT = "onnx"
 
+# Exports awaiting validation are uploaded under this prefix of BUCKET_OUTPUT
+PENDING_PREFIX = ".pending/"
+
+# Ranged GET settings for large objects (weights)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024 * 1024
+DOWNLOAD_WORKERS = 8
+
+# Multipart PUT settings for the exported ONNX file
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+UPLOAD_WORKERS = 4
+
+# Buckets already verified/created by this (warm) container
+_bucket_cache: set = set()
+_bucket_lock = threading.Lock()
+
 
 # ============================================================
 # ENTRY POINT
@@ -65,146 +105,415 @@ def execute(req: dict) -> dict:
     model_class = req["model_class"]
     dynamic_args = parse_dynamic_args(req.get("args", ""))
     input_shape = req.get("input_shape", [3, 224, 224])
+    optimize = req.get("optimize", False)
+    if not isinstance(optimize, bool):
+        raise ValueError(f"'optimize' must be a boolean, got {optimize!r}")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory(dir=WORK_DIR) as tmpdir:
         py_local = os.path.join(tmpdir, os.path.basename(python_path))
         weights_local = os.path.join(tmpdir, os.path.basename(weights_path))
         onnx_local = os.path.join(tmpdir, f"{model_class}.onnx")
 
         # ------------------------------------------------------------
-        # 1. Verify MinIO connectivity
+        # 1. Download model source + weights
+        #    (MinIO connectivity errors surface from here)
         # ------------------------------------------------------------
         try:
-            client.list_buckets()
-            logging.info(f"Connected to MinIO at {MINIO_ENDPOINT}")
-        except Exception as e:
+            # Both transfers are independent: overlap them, and stop the
+            # weights download as soon as the other one fails
+            abort = threading.Event()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = {
+                    executor.submit(client.fget_object, BUCKET_MODELS, python_path, py_local):
+                        f"model code: {BUCKET_MODELS}/{python_path}",
+                    executor.submit(download_object_parallel, BUCKET_WEIGHTS, weights_path, weights_local, abort):
+                        f"weights: {BUCKET_WEIGHTS}/{weights_path}",
+                }
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        logging.info(f"Downloaded {futures[future]}")
+                except BaseException:
+                    abort.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        except S3Error as e:
+            raise FileNotFoundError(f"Missing model or weights file: {e}")
+        except HTTPError as e:
+            # Network failures only: local OSErrors (e.g. ENOSPC) propagate unchanged
             raise ConnectionError(f"Unable to connect to MinIO ({MINIO_ENDPOINT}): {e}")
 
         # ------------------------------------------------------------
-        # 2. Download model source + weights
+        # 2. Return a previous export of the same model, if any
         # ------------------------------------------------------------
+        export_key = export_cache_key(model_class, input_shape, dynamic_args, py_local, weights_local)
+        output_key = f"{export_key}-opt.onnx" if optimize else f"{export_key}.onnx"
         try:
-            client.fget_object(BUCKET_MODELS, python_path, py_local)
-            logging.info(f"Downloaded model code: {BUCKET_MODELS}/{python_path}")
-
-            client.fget_object(BUCKET_WEIGHTS, weights_path, weights_local)
-            logging.info(f"Downloaded weights: {BUCKET_WEIGHTS}/{weights_path}")
-        except S3Error as e:
-            raise FileNotFoundError(f"Missing model or weights file: {e}")
+            client.stat_object(BUCKET_OUTPUT, output_key)
+            logging.info(f"Found cached ONNX model at {BUCKET_OUTPUT}/{output_key}")
+            return {
+                "status": "success",
+                "message": "Model already exported; returning cached ONNX.",
+                "onnx_path": output_key,
+                "download_url": object_url(BUCKET_OUTPUT, output_key)
+            }
+        except S3Error:
+            logging.info(f"No cached ONNX model for {output_key}, exporting")
 
         # ------------------------------------------------------------
         # 3. Load model
         # ------------------------------------------------------------
-        model = load_class_from_file(model_class, os.path.dirname(py_local), py_local, **dynamic_args)
-        model.load_state_dict(torch.load(weights_local, map_location=DEVICE))
-        model = model.to(DEVICE).eval()
+        model = load_model(get_class_from_file(model_class, py_local), dynamic_args, weights_local)
+        model = model.to(DEVICE).eval().requires_grad_(False)
+        gc.collect()
+        if DEVICE.type == "cuda":
+            torch.cuda.empty_cache()
 
-        dummy_input = torch.randn(1, *input_shape, device=DEVICE)
+        # Only shape/dtype matter for tracing: allocate uninitialized,
+        # no RNG kernel. Match the weights' precision so FP16/BF16 models
+        # trace without Casts.
+        param_dtype = next((p.dtype for p in model.parameters() if p.is_floating_point()), torch.float32)
+        dummy_input = torch.empty((1, *input_shape), dtype=param_dtype, device=DEVICE)
 
         # ------------------------------------------------------------
         # 4. Export to ONNX (modern + legacy support)
         # ------------------------------------------------------------
-        export_onnx(model, dummy_input, onnx_local)
+        program_path = None
+        if EXPORT_CACHE_DIR and os.path.isdir(EXPORT_CACHE_DIR):
+            # export_key already covers torch.__version__; programs also
+            # embed device placement, so CPU and CUDA pods keep separate entries
+            program_path = os.path.join(EXPORT_CACHE_DIR, f"{export_key}-{DEVICE.type}.pt2")
+        export_onnx(model, dummy_input, onnx_local, program_path)
+        if optimize:
+            optimize_onnx(onnx_local)
 
         # ------------------------------------------------------------
-        # 5. Validate ONNX correctness
+        # 5. Validate ONNX correctness + upload back to MinIO
+        #    (the checker only reads the file, so both run concurrently;
+        #    the upload goes to a pending key and only becomes visible as
+        #    a cache entry under output_key once validation passed)
         # ------------------------------------------------------------
-        onnx_model = onnx.load(onnx_local)
-        onnx.checker.check_model(onnx_model)
-        logging.info("✅ ONNX model validated successfully")
-
-        # ------------------------------------------------------------
-        # 6. Upload back to MinIO
-        # ------------------------------------------------------------
-        output_key = f"{model_class}.onnx"
-        if not client.bucket_exists(BUCKET_OUTPUT):
-            client.make_bucket(BUCKET_OUTPUT)
-        client.fput_object(BUCKET_OUTPUT, output_key, onnx_local)
+        ensure_bucket(BUCKET_OUTPUT)
+        pending_key = f"{PENDING_PREFIX}{uuid.uuid4().hex}/{output_key}"
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            upload = executor.submit(upload_object_parallel, BUCKET_OUTPUT, pending_key, onnx_local)
+            # Pass the path so the C++ checker reads the file directly,
+            # skipping a full ModelProto parse in Python
+            check = executor.submit(onnx.checker.check_model, onnx_local, full_check=False)
+            try:
+                upload.result()
+                check.result()
+                logging.info("✅ ONNX model validated successfully")
+                client.copy_object(BUCKET_OUTPUT, output_key, CopySource(BUCKET_OUTPUT, pending_key))
+            finally:
+                if upload.done() and upload.exception() is None:
+                    client.remove_object(BUCKET_OUTPUT, pending_key)
         logging.info(f"Uploaded ONNX model to {BUCKET_OUTPUT}/{output_key}")
 
-        # ------------------------------------------------------------
-        # 7. Construct download URL
-        # ------------------------------------------------------------
-        scheme = "https" if MINIO_SECURE else "http"
-        url = urljoin(f"{scheme}://{MINIO_ENDPOINT}/", f"{BUCKET_OUTPUT}/{output_key}")
-
         return {
             "status": "success",
             "message": "Model exported and validated successfully.",
             "onnx_path": output_key,
-            "download_url": url
+            "download_url": object_url(BUCKET_OUTPUT, output_key)
         }
 
 
+def load_model(class_, dynamic_args, weights_local):
+    """
+    Instantiate the model and load its weights from an mmap'd checkpoint.
+
+    The skeleton is built on "meta" (no allocation) and the checkpoint tensors
+    become the parameters directly. If the constructor cannot run on meta,
+    or loading leaves meta tensors behind (e.g. non-persistent buffers) or
+    changes the declared dtypes, the model is built on CPU and loaded by copy.
+    """
+    # Legacy (non-zipfile) checkpoints cannot be mapped: load them into memory
+    try:
+        state_dict = torch.load(weights_local, map_location="cpu", mmap=True)
+    except RuntimeError as e:
+        logging.info(f"mmap load not supported for {weights_local} ({e}), loading into memory")
+        state_dict = torch.load(weights_local, map_location="cpu")
+
+    model = None
+    try:
+        with torch.device("meta"):
+            model = class_(**dynamic_args)
+    except Exception as e:
+        # e.g. constructors calling .item()/.tolist() on tensors
+        logging.info(f"Model cannot be built on meta device ({e})")
+
+    if model is not None:
+        declared = {name: t.dtype for name, t in model.state_dict(keep_vars=True).items()}
+        model.load_state_dict(state_dict, assign=True)
+
+        # Parameters/buffers missing from the checkpoint, plus plain tensor attributes
+        tensors = list(model.parameters()) + list(model.buffers())
+        tensors += [v for m in model.modules() for v in vars(m).values() if torch.is_tensor(v)]
+        leftover_meta = any(t.is_meta for t in tensors)
+        dtype_changed = any(
+            declared.get(name, t.dtype) != t.dtype
+            for name, t in model.state_dict(keep_vars=True).items()
+        )
+        if leftover_meta or dtype_changed:
+            model = None
+
+    if model is None:
+        logging.info("Meta-device load not applicable, loading weights by copy")
+        model = class_(**dynamic_args)
+        model.load_state_dict(state_dict)
+
+    return model
+
+
+def export_cache_key(model_class, input_shape, dynamic_args, py_local, weights_local):
+    """
+    Key identifying an export: same weights, model code, constructor
+    args and input shape, under the same exporter configuration, always
+    produce the same traced graph.
+    """
+    digest = hashlib.sha256()
+    for path in (weights_local, py_local):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    digest.update(repr(sorted(dynamic_args.items())).encode())
+    digest.update(f"{torch.__version__}|{EXPORT_MODE}|{OPSET_VERSION}".encode())
+
+    shape = "x".join(map(str, input_shape))
+    return f"{model_class}-{digest.hexdigest()[:16]}-{shape}"
+
+
+def object_url(bucket, key):
+    """Direct download URL for an object on the configured MinIO endpoint."""
+    scheme = "https" if MINIO_SECURE else "http"
+    return urljoin(f"{scheme}://{MINIO_ENDPOINT}/", f"{bucket}/{key}")
+
+
+def ensure_bucket(bucket):
+    """
+    Create the bucket if missing. The check runs once per container,
+    so warm invocations skip the round-trip entirely.
+    """
+    if bucket in _bucket_cache:
+        return
+    with _bucket_lock:
+        if bucket not in _bucket_cache:
+            if not client.bucket_exists(bucket):
+                client.make_bucket(bucket)
+            _bucket_cache.add(bucket)
+
+
+def download_object_parallel(bucket, key, file_path, abort=None):
+    """
+    Download an object with concurrent ranged GETs written in place.
+    Objects smaller than one chunk fall back to a plain fget_object().
+    Setting the abort event (or any range failing) stops the remaining ranges.
+    """
+    abort = abort or threading.Event()
+    stat = client.stat_object(bucket, key)
+    size = stat.size
+    if size <= DOWNLOAD_CHUNK_SIZE:
+        client.fget_object(bucket, key, file_path)
+        return
+
+    # Pin every range to the same object version
+    headers = {"If-Match": stat.etag}
+
+    def fetch(fd, offset, length):
+        response = client.get_object(bucket, key, offset=offset, length=length, request_headers=headers)
+        try:
+            # Stream the range instead of buffering it whole
+            for data in response.stream(1024 * 1024):
+                if abort.is_set():
+                    raise CancelledError(f"Download of {bucket}/{key} aborted")
+                view = memoryview(data)
+                while view:
+                    written = os.pwrite(fd, view, offset)
+                    offset += written
+                    view = view[written:]
+        finally:
+            response.close()
+            response.release_conn()
+
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = [
+                executor.submit(fetch, fd, offset, min(DOWNLOAD_CHUNK_SIZE, size - offset))
+                for offset in range(0, size, DOWNLOAD_CHUNK_SIZE)
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                abort.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        os.close(fd)
+
+
+def upload_object_parallel(bucket, key, file_path):
+    """
+    Upload a local file as a multipart PUT with parts sent concurrently.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb", buffering=0) as f:
+        client.put_object(
+            bucket,
+            key,
+            f,
+            size,
+            part_size=UPLOAD_PART_SIZE,
+            num_parallel_uploads=UPLOAD_WORKERS
+        )
+
+
 # ============================================================
 # ONNX EXPORTER — FIXED IMPLEMENTATION
 # ============================================================
-def export_onnx(model, dummy_input, output_path):
+def export_onnx(model, dummy_input, output_path, program_path=None):
     """
     Export model to ONNX as a single file (no external data).
-    Handles both modern and legacy PyTorch ONNX exporters.
+    Uses the dynamo-based exporter when available and retries with the legacy
+    one (on the original dummy input) if it fails. With the dynamo exporter,
+    the torch.export program is reused from / saved to program_path so
+    repeated exports skip tracing.
     """
-    logging.info("Starting ONNX export...")
+    logging.info(f"Starting ONNX export ({EXPORT_MODE})...")
+
+    # no_grad rather than inference_mode: inference tensors are rejected
+    # by torch.export and by some ops during legacy JIT tracing
+    with torch.no_grad():
+        if EXPORT_MODE == "dynamo":
+            try:
+                export_onnx_dynamo(model, dummy_input, output_path, program_path)
+            except Exception as e:
+                logging.warning(f"Dynamo export failed: {e}. Falling back to legacy exporter.")
+                export_onnx_legacy(model, dummy_input, output_path)
+        else:
+            export_onnx_legacy(model, dummy_input, output_path)
+
+    # Ensure the model is a single file
+    ensure_single_file_onnx(output_path)
+
+    logging.info(f"✅ ONNX model exported via torch.onnx.export() to {output_path}")
 
-    # Try modern exporter first (PyTorch >= 2.1)
-    if hasattr(torch.onnx, "dynamo_export"):
-        try:
-            logging.info("Attempting torch.onnx.dynamo_export()")
-            
-            # Export with dynamo
-            export_options = torch.onnx.ExportOptions(
-                dynamic_shapes=True,
-                op_level_debug=False
-            )
-            
-            exported = torch.onnx.dynamo_export(
-                model, 
-                dummy_input,
-                export_options=export_options
-            )
-            
-            # Save with external data disabled
-            exported.save(output_path)
-            
-            # Force inline all data if it was externalized
-            ensure_single_file_onnx(output_path)
-            
-            logging.info(f"✅ ONNX model saved via dynamo_export to {output_path}")
-            return
-            
-        except Exception as e:
-            logging.warning(f"dynamo_export() failed: {e}. Falling back to legacy exporter.")
 
-    # Fallback to legacy exporter (PyTorch <= 2.0 or if dynamo fails)
-    logging.info("Using torch.onnx.export() (legacy)")
-    
+def export_onnx_dynamo(model, dummy_input, output_path, program_path=None):
+    """Export through torch.export, with a dynamic batch dimension."""
+    # torch.export specializes size-1 dims, so trace with a batch of 2
+    # to keep the batch dimension dynamic (a real allocation, not an
+    # expand(): stride-0 inputs break in-place ops in forward())
+    batch = torch.export.Dim("batch", min=1, max=128)
+    args = (torch.empty((2, *dummy_input.shape[1:]), dtype=dummy_input.dtype, device=dummy_input.device),)
+    dynamic_shapes = ({0: batch},)
+
+    export_args = base_export_args(output_path)
+    export_args["args"] = args
+    export_args["dynamo"] = True
+    if program_path:
+        export_args["model"] = load_or_export_program(model, args, dynamic_shapes, program_path)
+    else:
+        export_args["model"] = model
+        export_args["dynamic_shapes"] = dynamic_shapes
+
+    torch.onnx.export(**export_args)
+
+
+def export_onnx_legacy(model, dummy_input, output_path):
+    """Export through the TorchScript-based exporter, with dynamic_axes."""
+    export_args = base_export_args(output_path)
+    export_args["model"] = model
+    export_args["args"] = (dummy_input,)
+    export_args["do_constant_folding"] = True
+    export_args["dynamic_axes"] = {
+        "input": {0: "batch_size"},
+        "output": {0: "batch_size"}
+    }
+
+    # Newer releases default to the dynamo exporter
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_args["dynamo"] = False
+
+    torch.onnx.export(**export_args)
+
+
+def base_export_args(output_path):
+    """torch.onnx.export() arguments shared by both exporters."""
     export_args = {
-        "model": model,
-        "args": (dummy_input,),
         "f": output_path,
         "export_params": True,
-        "opset_version": 17,
-        "do_constant_folding": True,
+        "opset_version": OPSET_VERSION,
         "input_names": ["input"],
         "output_names": ["output"],
-        "dynamic_axes": {
-            "input": {0: "batch_size"}, 
-            "output": {0: "batch_size"}
-        }
     }
 
     # Disable external data format if parameter exists
     sig = inspect.signature(torch.onnx.export)
-    if "use_external_data_format" in sig.parameters:
+    if "external_data" in sig.parameters:
+        export_args["external_data"] = False
+        logging.info("Set external_data=False")
+    elif "use_external_data_format" in sig.parameters:
         export_args["use_external_data_format"] = False
         logging.info("Set use_external_data_format=False")
 
-    torch.onnx.export(**export_args)
-    
-    # Ensure the model is a single file
-    ensure_single_file_onnx(output_path)
-    
-    logging.info(f"✅ ONNX model exported via torch.onnx.export() to {output_path}")
+    return export_args
+
+
+def load_or_export_program(model, args, dynamic_shapes, program_path):
+    """
+    Return the torch.export program for the model, tracing it only if no
+    usable saved copy exists at program_path. Tracing errors propagate so
+    export_onnx() can fall back to the legacy exporter.
+    """
+    if os.path.exists(program_path):
+        try:
+            logging.info(f"Loading cached ExportedProgram from {program_path}")
+            return torch.export.load(program_path)
+        except Exception as e:
+            logging.warning(f"Cached ExportedProgram unusable, re-tracing: {e}")
+
+    with torch.no_grad():
+        program = torch.export.export(model, args, dynamic_shapes=dynamic_shapes)
+
+    # Write then rename, so concurrent requests never read a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(program_path), suffix=".tmp")
+    os.close(fd)
+    try:
+        torch.export.save(program, tmp_path)
+        os.replace(tmp_path, program_path)
+        logging.info(f"Saved ExportedProgram to {program_path}")
+    except Exception as e:
+        logging.warning(f"Could not cache ExportedProgram: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return program
+
+
+def optimize_onnx(onnx_path):
+    """
+    Apply graph-level fusions so ONNX Runtime can load the model ready to run.
+    """
+    # Imported here: the optimizer is opt-in and must not break cold start
+    import onnxoptimizer
+
+    logging.info("Optimizing ONNX graph...")
+    model = onnx.load(onnx_path)
+    model = onnxoptimizer.optimize(model, [
+        "eliminate_deadend",
+        "eliminate_identity",
+        "fuse_bn_into_conv",
+        "fuse_add_bias_into_conv",
+    ])
+    onnx.save(model, onnx_path)
+    logging.info(f"✅ Optimized ONNX model saved to {onnx_path}")
 
 
 def ensure_single_file_onnx(onnx_path):
@@ -212,45 +521,32 @@ def ensure_single_file_onnx(onnx_path):
     Ensures ONNX model is stored as a single file by converting external data to inline.
     This fixes the issue where models reference missing .onnx.data files.
     """
+    # Common case: nothing was externalized, no need to parse the model
+    external_data_path = onnx_path + ".data"
+    if not os.path.exists(external_data_path):
+        return
+
     try:
-        # Check if external data file exists
-        external_data_path = onnx_path + ".data"
-        
+        logging.info(f"Found external data file: {external_data_path}")
+        logging.info("Converting to single-file format...")
+
+        # Inline the external tensors (this also resets their data_location)
+        model = onnx.load(onnx_path, load_external_data=False)
+        onnx.external_data_helper.load_external_data_for_model(model, os.path.dirname(onnx_path))
+
+        # Serialize once straight to disk, bypassing onnx.save(); serialize
+        # before opening so a failure (e.g. >2 GB proto) leaves the file intact
+        data = model.SerializeToString()
+        with open(onnx_path, "wb") as f:
+            f.write(data)
+
+        # Clean up external data file
         if os.path.exists(external_data_path):
-            logging.info(f"Found external data file: {external_data_path}")
-            logging.info("Converting to single-file format...")
-            
-            # Load model with external data
-            model = onnx.load(onnx_path, load_external_data=True)
-            
-            # Save with all data inline (no external data)
-            onnx.save(
-                model, 
-                onnx_path,
-                save_as_external_data=False
-            )
-            
-            # Clean up external data file
-            if os.path.exists(external_data_path):
-                os.remove(external_data_path)
-                logging.info(f"Removed external data file: {external_data_path}")
-            
-            logging.info("✅ Converted to single-file ONNX format")
-        else:
-            # Verify model loads correctly
-            model = onnx.load(onnx_path)
-            
-            # Check if model references external data
-            for tensor in model.graph.initializer:
-                if tensor.HasField('data_location') and tensor.data_location == onnx.TensorProto.EXTERNAL:
-                    logging.warning("Model references external data but file is missing!")
-                    logging.info("Attempting to re-save as single file...")
-                    
-                    # Re-save as single file
-                    onnx.save(model, onnx_path, save_as_external_data=False)
-                    logging.info("✅ Re-saved as single-file ONNX")
-                    break
-                    
+            os.remove(external_data_path)
+            logging.info(f"Removed external data file: {external_data_path}")
+
+        logging.info("✅ Converted to single-file ONNX format")
+
     except Exception as e:
         logging.warning(f"Could not verify/convert ONNX format: {e}")
-        # Continue anyway - the export might still be valid
\ No newline at end of file
+        # Continue anyway - the export might still be valid
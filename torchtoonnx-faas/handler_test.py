@@ -1,4 +1,7 @@
+import pytest
+
 from .handler import handle
+from .utils import parse_dynamic_args
 
 # Test your handler here
 
@@ -8,3 +11,25 @@ from .handler import handle
 def test_handle():
     # assert handle("input") == "input"
     pass
+
+
+@pytest.mark.parametrize("args, expected", [
+    ("", {}),
+    ("a=1 b=-2 c=+3", {"a": 1, "b": -2, "c": 3}),
+    ("x=3.5 y=.5 z=1. e=1e3 f=-2.5E-1", {"x": 3.5, "y": 0.5, "z": 1.0, "e": 1000.0, "f": -0.25}),
+    ("a=inf b=nan c=1_000 d=1.2.3 e=abc", {"a": "inf", "b": "nan", "c": "1_000", "d": "1.2.3", "e": "abc"}),
+    ("k=a=b", {"k": "a=b"}),
+    # Quoting/escaping goes through shlex
+    ("name='hello world' n=4", {"name": "hello world", "n": 4}),
+    ('path="a b" v="7"', {"path": "a b", "v": 7}),
+    (r"s=a\ b", {"s": "a b"}),
+])
+def test_parse_dynamic_args(args, expected):
+    parsed = parse_dynamic_args(args)
+    assert parsed == expected
+    assert all(type(parsed[k]) is type(v) for k, v in expected.items())
+
+
+def test_parse_dynamic_args_rejects_bare_token():
+    with pytest.raises(ValueError):
+        parse_dynamic_args("a=1 oops")
@@ -1,36 +1,70 @@
 import importlib.util
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 import onnx
 from torch import onnx as torch_onnx
+import re
 import shlex
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def load_class_from_file(class_name, module_path, file_path, **kwargs):
+# Numeric literals accepted in dynamic args
+_INT_RE = re.compile(r"[+-]?\d+$")
+_FLOAT_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+# Modules already executed by this (warm) container, keyed on source digest
+# (the file itself lands in a fresh temp dir on every call)
+MODULE_CACHE_SIZE = 32
+_module_cache = OrderedDict()
+_module_lock = threading.Lock()
+
+
+def _load_module(file_path):
+    """
+    Import a Python file, reusing the module if the same source was already loaded.
+    """
+    with open(file_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    with _module_lock:
+        if digest in _module_cache:
+            _module_cache.move_to_end(digest)
+            logging.debug(f"Reusing cached module for file: {file_path}")
+            return _module_cache[digest]
+
+        spec = importlib.util.spec_from_file_location("module.name", file_path)
+        if spec is None:
+            raise ImportError(f"Unable to load spec for file: {file_path}")
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        logging.debug(f"Loaded module from file: {file_path}")
+
+        _module_cache[digest] = module
+        if len(_module_cache) > MODULE_CACHE_SIZE:
+            _module_cache.popitem(last=False)
+        return module
+
+
+def get_class_from_file(class_name, file_path):
     """
-    Dynamically load a class from a Python file.
+    Dynamically import a Python file and return one of its classes.
     Args:
         class_name (str): Name of the class to load.
-        module_path (str): Directory containing the file.
         file_path (str): Full path to the Python file.
-        kwargs: Additional arguments for the class constructor.
     Returns:
-        object: An instance of the loaded class.
+        type: The class object (not instantiated).
     """
     try:
         logging.debug(f"Loading class '{class_name}' from file: {file_path}")
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        spec = importlib.util.spec_from_file_location("module.name", file_path)
-        if spec is None:
-            raise ImportError(f"Unable to load spec for file: {file_path}")
-
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        logging.debug(f"Loaded module from file: {file_path}")
+        module = _load_module(file_path)
 
         # Safely get the class
         if not hasattr(module, class_name):
@@ -39,12 +73,9 @@ def load_class_from_file(class_name, module_path, file_path, **kwargs):
         class_ = getattr(module, class_name)
         if not callable(class_):
             raise TypeError(f"'{class_name}' is not a valid class.")
-
-        # Log arguments being passed to the class
-        logging.debug(f"Arguments passed to '{class_name}': {kwargs}")
-        return class_(**kwargs)
+        return class_
     except Exception as e:
-        logging.error("Error in load_class_from_file.", exc_info=True)
+        logging.error("Error in get_class_from_file.", exc_info=True)
         raise
 
 
@@ -58,8 +89,12 @@ def parse_dynamic_args(args):
     """
     try:
         logging.debug(f"Parsing dynamic args: {args}")
-        # Use shlex to split args while respecting quotes
-        args_list = shlex.split(args)
+        # Plain 'key=value' strings need no shell-style splitting;
+        # fall back to shlex only when quoting/escaping is involved
+        if '"' in args or "'" in args or "\\" in args:
+            args_list = shlex.split(args)
+        else:
+            args_list = args.split()
         parsed_args = {}
         for arg in args_list:
             if "=" in arg:
@@ -69,13 +104,10 @@ def parse_dynamic_args(args):
                 raise ValueError(f"Invalid argument format: '{arg}'. Expected 'key=value'.")
         # Convert numerical values where applicable
         for key, value in parsed_args.items():
-            if value.isdigit():
+            if _INT_RE.match(value):
                 parsed_args[key] = int(value)
-            else:
-                try:
-                    parsed_args[key] = float(value)
-                except ValueError:
-                    pass
+            elif _FLOAT_RE.match(value):
+                parsed_args[key] = float(value)
         logging.debug(f"Parsed args: {parsed_args}")
         return parsed_args
     except Exception as e: